@@ -56,6 +56,7 @@ __all__ = [
 
 import copy
 import io
+import itertools
 import pathlib
 import re
 import unittest
@@ -92,9 +93,64 @@ ABC_BARS = [
     (':', 'dotted'),
 ]
 
+# store just the bar symbols, in the same order, for matching
+ABC_BAR_SYMBOLS = tuple(abcStr for abcStr, unused_barTypeString in ABC_BARS)
+
+# store broken rhythm symbols and their (left, right) duration multipliers
+ABC_BROKEN_RHYTHM_MODIFIERS = {
+    '>': (1.5, 0.5),
+    '<': (0.5, 1.5),
+    '>>': (1.75, 0.25),
+    '<<': (0.25, 1.75),
+    '>>>': (1.875, 0.125),
+    '<<<': (0.125, 1.875),
+}
+
+# store collected note strings that are not supported, or that are the
+# result of errors in encoded files; these are dropped by the tokenizer
+ABC_UNSUPPORTED_NOTE_COLLECTIONS = frozenset([
+    'w', 'u', 'v', 'v.', 'h', 'H', 'vk',
+    'uk', 'U', '~',
+    '.', '=', 'V', 'S', 's',
+    'i', 'I', 'ui', 'u.', 'Q', 'Hy', 'Hx',
+    'r', 'm', 'M', 'n', 'N', 'o', 'O', 'P',
+    'l', 'L', 'R',
+    'y', 'T', 't', 'x', 'Z',
+])
+
+# store key names to match in a key (K:) field, longest first;
+# abc uses b for flat in key spec only
+ABC_KEY_NAMES = tuple(sorted(['c', 'g', 'd', 'a', 'e', 'b', 'f#', 'g#', 'a#',
+                              'f', 'bb', 'eb', 'd#', 'ab', 'e#', 'db', 'c#', 'gb', 'cb',
+                              # HP or Hp are used for highland pipes
+                              'hp'],
+                             key=len, reverse=True))
+
 # store a mapping of ABC representation to pitch values
 _pitchTranslationCache = {}
 
+# store a mapping of ABC key field data to (sharps, mode) pairs
+_keySignatureParametersCache = {}
+
+# store a mapping of ABC chord contents to (token class, source, carried accidental)
+# triples for the notes (or malformed nested chords) found within
+_chordNoteCache = {}
+
+
+def _abcAccidentalsToM21(strSrc: str) -> str:
+    '''
+    Return the music21 accidental symbols for the ABC accidentals
+    (flats, sharps, then naturals) found in strSrc.
+
+    >>> abcFormat._abcAccidentalsToM21('^^f')
+    '##'
+    >>> abcFormat._abcAccidentalsToM21('=_B,')
+    '-n'
+    >>> abcFormat._abcAccidentalsToM21('c')
+    ''
+    '''
+    return '-' * strSrc.count('_') + '#' * strSrc.count('^') + 'n' * strSrc.count('=')
+
 
 # ------------------------------------------------------------------------------
 # note inclusion of w: for lyrics
@@ -104,6 +160,9 @@ reChordSymbol = re.compile('"[^"]*"')  # non greedy
 reChord = re.compile('[.*?]')  # non greedy
 reAbcVersion = re.compile(r'^%abc-((\d+)\.(\d+)\.?(\d+)?)')
 reDirective = re.compile(r'^%%([a-z\-]+)\s+([^\s]+)(.*)')
+# any reference number line; group 1 is the number, if nothing else is on the line.
+# [^\S\n] is any whitespace but a line break, so '\r\n' endings match
+reReferenceNumber = re.compile(r'^[^\S\n]*X:[^\S\n]*(?:(\d+)[^\S\n]*$)?', re.MULTILINE)
 
 
 # ------------------------------------------------------------------------------
@@ -136,6 +195,9 @@ class ABCToken(prebase.ProtoM21Object):
 
     The source ABC string itself is stored in self.src
     '''
+
+    __slots__ = ('src',)
+
     def __init__(self, src=''):
         self.src: str = src  # store source character sequence
 
@@ -207,6 +269,9 @@ class ABCMetadata(ABCToken):
     >>> md.data
     'linebreak'
     '''
+
+    __slots__ = ('tag', 'data')
+
     # given a logical unit, create an object
     # may be a chord, notes, metadata, bars
     def __init__(self, src=''):
@@ -455,24 +520,23 @@ class ABCMetadata(ABCToken):
         (-2, 'aeolian')
 
         '''
-        # placing this import in method for now; key.py may import this module
-        from music21 import key
-
         if not self.isKey():
             raise ABCTokenException('no key signature associated with this metadata.')
 
-        # abc uses b for flat in key spec only
-        keyNameMatch = ['c', 'g', 'd', 'a', 'e', 'b', 'f#', 'g#', 'a#',
-                        'f', 'bb', 'eb', 'd#', 'ab', 'e#', 'db', 'c#', 'gb', 'cb',
-                        # HP or Hp are used for highland pipes
-                        'hp']
+        # the same few keys recur throughout a tune book
+        data = self.data
+        if data in _keySignatureParametersCache:
+            return _keySignatureParametersCache[data]
+
+        # placing this import in method for now; key.py may import this module
+        from music21 import key
 
         # if no match, provide defaults,
         # this is probably an error or badly formatted
         standardKeyStr = 'C'
         stringRemain = ''
         # first, get standard key indication
-        for target in sorted(keyNameMatch, key=len, reverse=True):
+        for target in ABC_KEY_NAMES:
             if target == self.data[:len(target)].lower():
                 # keep case
                 standardKeyStr = self.data[:len(target)]
@@ -516,7 +580,9 @@ class ABCMetadata(ABCToken):
         # not yet implemented: checking for additional chromatic alternations
         # e.g.: K:D =c would write the key signature as two sharps
         # (key of D) but then mark every  c  as  natural
-        return key.pitchToSharps(standardKeyStr, mode), mode
+        parameters = (key.pitchToSharps(standardKeyStr, mode), mode)
+        _keySignatureParametersCache[data] = parameters
+        return parameters
 
     def getKeySignatureObject(self):
         # noinspection SpellCheckingInspection,PyShadowingNames
@@ -755,6 +821,12 @@ class ABCMetadata(ABCToken):
 class ABCBar(ABCToken):
     # given a logical unit, create an object
     # may be a chord, notes, metadata, bars
+    __slots__ = (
+        'barType',
+        'barStyle',
+        'repeatForm',
+    )
+
     def __init__(self, src):
         super().__init__(src)
         self.barType = None  # repeat or barline
@@ -903,6 +975,14 @@ class ABCTuplet(ABCToken):
 
     In ABCHandler.tokenProcess(), rhythms are adjusted.
     '''
+
+    __slots__ = (
+        'noteCount',
+        'numberNotesActual',
+        'numberNotesNormal',
+        'tupletObj',
+    )
+
     def __init__(self, src):
         super().__init__(src)
 
@@ -1089,6 +1169,9 @@ class ABCTie(ABCToken):
     Ties are treated as an attribute of the note before the '-';
     the note after is marked as the end of the tie.
     '''
+
+    __slots__ = ('noteObj',)
+
     def __init__(self, src):
         super().__init__(src)
         self.noteObj = None
@@ -1099,6 +1182,9 @@ class ABCSlurStart(ABCToken):
     ABCSlurStart tokens always precede the notes in a slur.
     For nested slurs, each open parenthesis gets its own token.
     '''
+
+    __slots__ = ('slurObj',)
+
     def __init__(self, src):
         super().__init__(src)
         self.slurObj = None
@@ -1118,6 +1204,8 @@ class ABCParenStop(ABCToken):
     comes at the end of a tuplet, slur, or dynamic marking.
     '''
 
+    __slots__ = ()
+
 
 class ABCCrescStart(ABCToken):
     '''
@@ -1126,6 +1214,8 @@ class ABCCrescStart(ABCToken):
     the closing string "!crescendo)" counts as an ABCParenStop.
     '''
 
+    __slots__ = ('crescObj',)
+
     def __init__(self, src):
         super().__init__(src)
         self.crescObj = None
@@ -1140,6 +1230,9 @@ class ABCDimStart(ABCToken):
     ABCDimStart tokens always precede the notes in a diminuendo.
     They function identically to ABCCrescStart tokens.
     '''
+
+    __slots__ = ('dimObj',)
+
     def __init__(self, src):    # previous typo?: used to be __init
         super().__init__(src)
         self.dimObj = None
@@ -1155,6 +1248,8 @@ class ABCStaccato(ABCToken):
     they are a property of that note/chord.
     '''
 
+    __slots__ = ()
+
 
 class ABCUpbow(ABCToken):
     '''
@@ -1162,6 +1257,8 @@ class ABCUpbow(ABCToken):
     they are a property of that note/chord.
     '''
 
+    __slots__ = ()
+
 
 class ABCDownbow(ABCToken):
     '''
@@ -1169,6 +1266,8 @@ class ABCDownbow(ABCToken):
     they are a property of that note/chord.
     '''
 
+    __slots__ = ()
+
 
 class ABCAccent(ABCToken):
     '''
@@ -1177,6 +1276,8 @@ class ABCAccent(ABCToken):
     These appear as ">" in the output.
     '''
 
+    __slots__ = ()
+
 
 class ABCStraccent(ABCToken):
     '''
@@ -1185,6 +1286,8 @@ class ABCStraccent(ABCToken):
     These appear as "^" in the output.
     '''
 
+    __slots__ = ()
+
 
 class ABCTenuto(ABCToken):
     '''
@@ -1192,24 +1295,52 @@ class ABCTenuto(ABCToken):
     they are a property of that note/chord.
     '''
 
+    __slots__ = ()
+
+
+# dynamics spanner markings and the token class each one starts or stops
+ABC_DYNAMICS_TOKENS = {
+    '!crescendo(!': ABCCrescStart,
+    '!crescendo)!': ABCParenStop,
+    '!diminuendo(!': ABCDimStart,
+    '!diminuendo)!': ABCParenStop,
+}
+
+# articulation tokens and the name of the articulation they add to the
+# following note or chord, in the order they are added
+ABC_ARTICULATION_TOKENS = {
+    ABCStaccato: 'staccato',
+    ABCUpbow: 'upbow',
+    ABCDownbow: 'downbow',
+    ABCAccent: 'accent',
+    ABCStraccent: 'strongaccent',
+    ABCTenuto: 'tenuto',
+}
+
 
 class ABCGraceStart(ABCToken):
     '''
     Grace note start
     '''
 
+    __slots__ = ()
+
 
 class ABCGraceStop(ABCToken):
     '''
     Grace note end
     '''
 
+    __slots__ = ()
+
 
 class ABCBrokenRhythmMarker(ABCToken):
     '''
     Marks that rhythm is broken with '>>>'
     '''
 
+    __slots__ = ('data',)
+
     def __init__(self, src):
         super().__init__(src)
         self.data = None
@@ -1240,6 +1371,26 @@ class ABCNote(ABCToken):
     these guitar chords) associated with this note. This attribute is
     updated when parse() is called.
     '''
+
+    __slots__ = (
+        'accidentalDisplayStatus',
+        'activeDefaultQuarterLength',
+        'activeKeySignature',
+        'activeTuplet',
+        'applicableSpanners',
+        'articulations',
+        'brokenRhythmMarker',
+        'carriedAccidental',
+        'chordSymbols',
+        'inBar',
+        'inBeam',
+        'inGrace',
+        'isRest',
+        'pitchName',
+        'quarterLength',
+        'tie',
+    )
+
     def __init__(self, src='', carriedAccidental=None):
         super().__init__(src)
 
@@ -1287,6 +1438,24 @@ class ABCNote(ABCToken):
         self.pitchName = None  # if None, a rest or chord
         self.quarterLength = None
 
+    def freeze(self) -> None:
+        '''
+        Called once contextual processing is complete: the lists of
+        applicable spanners and articulations are only read from then on,
+        so store them as tuples.  Empty lists all become the shared
+        empty tuple.
+
+        >>> an = abcFormat.ABCNote('c')
+        >>> an.articulations.append('staccato')
+        >>> an.freeze()
+        >>> an.articulations
+        ('staccato',)
+        >>> an.applicableSpanners
+        ()
+        '''
+        self.applicableSpanners = tuple(self.applicableSpanners)
+        self.articulations = tuple(self.articulations)
+
     @staticmethod
     def _splitChordSymbols(strSrc):
         '''
@@ -1374,7 +1543,7 @@ class ABCNote(ABCToken):
         Traceback (most recent call last):
         music21.abcFormat.ABCHandlerException: cannot find any pitch information in: 'x'
         '''
-        environLocal.printDebug(['getPitchName:', strSrc])
+        # environLocal.printDebug(['getPitchName:', strSrc])
 
         # skip some articulations parsed with the pitch
         # some characters are errors in parsing or encoding not yet handled
@@ -1395,10 +1564,10 @@ class ABCNote(ABCToken):
         else:  # may be None
             activeKeySignature = self.activeKeySignature
 
+        # build the cache key once: str() of a key signature is not free
+        _cacheKey = (strSrc, self.carriedAccidental, str(activeKeySignature))
         try:  # returns pStr, accidentalDisplayStatus
-            return _pitchTranslationCache[(strSrc,
-                                           self.carriedAccidental,
-                                           str(activeKeySignature))]
+            return _pitchTranslationCache[_cacheKey]
         except KeyError:
             pass
 
@@ -1412,24 +1581,13 @@ class ABCNote(ABCToken):
 
         # get an accidental string
 
-        accString = ''
-        for dummy in range(strSrc.count('_')):
-            accString += '-'  # m21 symbols
-        for dummy in range(strSrc.count('^')):
-            accString += '#'  # m21 symbols
-        for dummy in range(strSrc.count('=')):
-            accString += 'n'  # m21 symbols
+        accString = _abcAccidentalsToM21(strSrc)
 
         carriedAccString = ''
         if self.carriedAccidental:
             # No overriding accidental attached to this note
             # force carrying through the measure.
-            for dummy in range(self.carriedAccidental.count('_')):
-                carriedAccString += '-'  # m21 symbols
-            for dummy in range(self.carriedAccidental.count('^')):
-                carriedAccString += '#'  # m21 symbols
-            for dummy in range(self.carriedAccidental.count('=')):
-                carriedAccString += 'n'  # m21 symbols
+            carriedAccString = _abcAccidentalsToM21(self.carriedAccidental)
 
         if carriedAccString and accString:
             raise ABCHandlerException('Carried accidentals not rendered moot.')
@@ -1468,12 +1626,6 @@ class ABCNote(ABCToken):
             pStr = f'{name.upper()}{accString}{octave}'
 
         # store in global cache for faster speed
-        _cacheKey = (
-            strSrc,
-            self.carriedAccidental,
-            str(activeKeySignature)
-        )
-
         _pitchTranslationCache[_cacheKey] = (pStr, accidentalDisplayStatus)
         return (pStr, accidentalDisplayStatus)
 
@@ -1578,20 +1730,7 @@ class ABCNote(ABCToken):
 
         if self.brokenRhythmMarker is not None:
             symbol, direction = self.brokenRhythmMarker
-            if symbol == '>':
-                modPair = (1.5, 0.5)
-            elif symbol == '<':
-                modPair = (0.5, 1.5)
-            elif symbol == '>>':
-                modPair = (1.75, 0.25)
-            elif symbol == '<<':
-                modPair = (0.25, 1.75)
-            elif symbol == '>>>':
-                modPair = (1.875, 0.125)
-            elif symbol == '<<<':
-                modPair = (0.125, 1.875)
-            else:  # pragma: no cover
-                modPair = (1, 1)
+            modPair = ABC_BROKEN_RHYTHM_MODIFIERS.get(symbol, (1, 1))
 
             # apply based on direction
             if direction == 'left':
@@ -1642,6 +1781,8 @@ class ABCChord(ABCNote):
     A subclass of ABCNote.
     '''
 
+    __slots__ = ('subTokens',)
+
     def __init__(self, src: str = ''):
         super().__init__(src)
         # store a list of component objects
@@ -1681,33 +1822,41 @@ class ABCChord(ABCNote):
         else:  # may be None
             activeKeySignature = self.activeKeySignature
 
-        # create a handler for processing internal chord notes
-        ah = ABCHandler()
-        # only tokenizing; not calling process() as these objects
-        # have no metadata
-        # may need to supply key?
-        ah.tokenize(tokenStr)
+        # the same chord contents recur throughout a tune; tokenize them once
+        # and keep only what is needed to build fresh note tokens
+        try:
+            noteSources = _chordNoteCache[tokenStr]
+        except KeyError:
+            # create a handler for processing internal chord notes
+            ah = ABCHandler()
+            # only tokenizing; not calling process() as these objects
+            # have no metadata
+            # may need to supply key?
+            ah.tokenize(tokenStr)
+            noteSources = tuple((t.__class__, t.src, t.carriedAccidental)
+                                for t in ah.tokens if isinstance(t, ABCNote))
+            _chordNoteCache[tokenStr] = noteSources
 
         inner_quarterLength = 0
-        # tokens contained here are each ABCNote instances
-        for t in ah.tokens:
+        for tokenClass, noteSrc, carriedAccidental in noteSources:
+            t = tokenClass(noteSrc)
+            t.carriedAccidental = carriedAccidental
             # environLocal.printDebug(['ABCChord: subTokens', t])
             # parse any tokens individually, supply local data as necessary
-            if isinstance(t, ABCNote):
-                t.parse(
-                    forceDefaultQuarterLength=self.activeDefaultQuarterLength,
-                    forceKeySignature=activeKeySignature)
+            t.parse(
+                forceDefaultQuarterLength=self.activeDefaultQuarterLength,
+                forceKeySignature=activeKeySignature)
 
-                if t.isRest:
-                    continue
+            if t.isRest:
+                continue
 
-                # get the quarter length from the sub-tokens
-                # All the notes within a chord should normally have the same length,
-                # but if not, the chord duration is that of the first note.
-                if not inner_quarterLength:
-                    inner_quarterLength = t.quarterLength
+            # get the quarter length from the sub-tokens
+            # All the notes within a chord should normally have the same length,
+            # but if not, the chord duration is that of the first note.
+            if not inner_quarterLength:
+                inner_quarterLength = t.quarterLength
 
-                self.subTokens.append(t)
+            self.subTokens.append(t)
 
 
         # When both inside and outside the chord length modifiers are used,
@@ -1730,6 +1879,22 @@ class ABCHandler:
 
     New in v6.3 -- lineBreaksDefinePhrases -- does not yet do anything
     '''
+
+    __slots__ = (
+        'abcVersion',
+        'abcDirectives',
+        'tokens',
+        'activeParens',
+        'activeSpanners',
+        'lineBreaksDefinePhrases',
+        'pos',
+        'skipAhead',
+        'isFirstComment',
+        'strSrc',
+        'srcLen',
+        'currentCollectStr',
+    )
+
     def __init__(self, abcVersion=None, lineBreaksDefinePhrases=False):
         # tokens are ABC objects import n a linear stream
         self.abcVersion = abcVersion
@@ -2049,8 +2214,11 @@ class ABCHandler:
         >>> abch.tokens
         [<music21.abcFormat.ABCTuplet '(6::2'>, <music21.abcFormat.ABCNote 'f'>]
         '''
-        self.srcLen = len(strSrc)
+        # keep the source, its length and the token list in locals for the
+        # loop below; the attributes are still set for processComment()
+        srcLen = self.srcLen = len(strSrc)
         self.strSrc = strSrc
+        tokens = self.tokens
         self.pos = -1
         self.currentCollectStr = ''
         self.skipAhead = 0
@@ -2063,83 +2231,71 @@ class ABCHandler:
         accidental = None
         abcPitch = None  # ABC substring defining any pitch within the current token
         self.isFirstComment = True
+        # how accidentals carry through the measure; only changes when a
+        # comment sets the abc version or a directive
+        propagation = self._accidentalPropagation()
 
-        while self.pos < self.srcLen - 1:
+        while self.pos < srcLen - 1:
             self.pos += 1
             self.pos += self.skipAhead
             self.skipAhead = 0
-            if self.pos > self.srcLen - 1:
+            if self.pos > srcLen - 1:
                 break
 
-            q = self._getLinearContext(self.strSrc, self.pos)
+            q = self._getLinearContext(strSrc, self.pos)
             unused_cPrev, c, cNext, cNextNext = q
             # cPrevNotSpace, cPrev, c, cNext, cNextNotSpace, cNextNext = q
 
             # comment lines, also encoding defs
             if c == '%':
                 self.processComment()
+                propagation = self._accidentalPropagation()
                 continue
 
             if self.startsMetadata(c, cNext, cNextNext):
                 # collect until end of line; add one to get line break
-                j = self._getNextLineBreak(self.strSrc, self.pos)
+                j = self._getNextLineBreak(strSrc, self.pos)
                 self.skipAhead = j - (self.pos + 1)
-                self.currentCollectStr = self.strSrc[self.pos:j].strip()
+                self.currentCollectStr = strSrc[self.pos:j].strip()
                 # environLocal.printDebug(['got metadata:', repr(self.currentCollectStr)])
-                self.tokens.append(ABCMetadata(self.currentCollectStr))
+                tokens.append(ABCMetadata(self.currentCollectStr))
                 continue
 
-            # get bars: if not a space and not alphanumeric
-            if not c.isspace() and not c.isalnum() and c not in ('~', '('):
-                matchBars = False
-                for barIndex in range(len(ABC_BARS)):
-                    # first of bars tuple is symbol to match
-                    # three possible sizes of bar indications: 3, 2, 1
-                    barTokenArchetype = ABC_BARS[barIndex][0]
-                    if len(barTokenArchetype) == 3:
-                        if cNextNext is not None and (c + cNext + cNextNext == barTokenArchetype):
-                            self.skipAhead = 2
-                            matchBars = True
-                            break
-                    elif cNext is not None and (len(barTokenArchetype) == 2):
-                        if c + cNext == barTokenArchetype:
-                            self.skipAhead = 1
-                            matchBars = True
-                            break
-                    elif len(barTokenArchetype) == 1:
-                        if c == barTokenArchetype:
-                            self.skipAhead = 0
-                            matchBars = True
-                            break
-                if matchBars is True:
-                    accidentalized = {}
-                    accidental = None
-                    j = self.pos + self.skipAhead + 1
-                    self.currentCollectStr = self.strSrc[self.pos:j]
-                    # filter and replace with 2 tokens if necessary
-                    for tokenSub in self.barlineTokenFilter(self.currentCollectStr):
-                        self.tokens.append(tokenSub)
-                    # environLocal.printDebug(['got bars:', repr(self.currentCollectStr)])
-                    # if self.currentCollectStr == '::':
-                    #     # create a start and and an end
-                    #     self.tokens.append(ABCBar(':|'))
-                    #     self.tokens.append(ABCBar('|:'))
-                    # else:
-                    #     self.tokens.append(ABCBar(self.currentCollectStr))
-                    continue
+            # get bars: test for all bar symbols at once first
+            if strSrc.startswith(ABC_BAR_SYMBOLS, self.pos):
+                # then find the one matched; longer symbols come first
+                for barTokenArchetype in ABC_BAR_SYMBOLS:
+                    if strSrc.startswith(barTokenArchetype, self.pos):
+                        self.skipAhead = len(barTokenArchetype) - 1
+                        break
+                accidentalized = {}
+                accidental = None
+                j = self.pos + self.skipAhead + 1
+                self.currentCollectStr = strSrc[self.pos:j]
+                # filter and replace with 2 tokens if necessary
+                for tokenSub in self.barlineTokenFilter(self.currentCollectStr):
+                    tokens.append(tokenSub)
+                # environLocal.printDebug(['got bars:', repr(self.currentCollectStr)])
+                # if self.currentCollectStr == '::':
+                #     # create a start and and an end
+                #     tokens.append(ABCBar(':|'))
+                #     tokens.append(ABCBar('|:'))
+                # else:
+                #     tokens.append(ABCBar(self.currentCollectStr))
+                continue
 
             # get tuplet indicators: (2, (3, (p:q:r or (3::
             if c == '(' and cNext is not None and cNext.isdigit():
                 self.skipAhead = 1
                 j = self.pos + self.skipAhead + 1  # always two characters
-                unused1, possibleColon, qChar, unused2 = self._getLinearContext(self.strSrc, j)
+                unused1, possibleColon, qChar, unused2 = self._getLinearContext(strSrc, j)
                 if possibleColon == ':':
                     j += 1
                     self.skipAhead += 1
                     if qChar is not None and qChar.isdigit():
                         j += 1
                         self.skipAhead += 1
-                    unused1, possibleColon, rChar, unused2 = self._getLinearContext(self.strSrc, j)
+                    unused1, possibleColon, rChar, unused2 = self._getLinearContext(strSrc, j)
                     if possibleColon == ':':
                         j += 1  # include the r characters
                         self.skipAhead += 1
@@ -2147,38 +2303,33 @@ class ABCHandler:
                             j += 1
                             self.skipAhead += 1
 
-                self.currentCollectStr = self.strSrc[self.pos:j]
+                self.currentCollectStr = strSrc[self.pos:j]
                 # environLocal.printDebug(['got tuplet start:', repr(self.currentCollectStr)])
-                self.tokens.append(ABCTuplet(self.currentCollectStr))
+                tokens.append(ABCTuplet(self.currentCollectStr))
                 continue
 
             # get broken rhythm modifiers: < or >, >>, up to <<<
             if c in '<>':
                 j = self.pos + 1
-                while j < self.srcLen - 1 and self.strSrc[j] in '<>':
+                while j < srcLen - 1 and strSrc[j] in '<>':
                     j += 1
-                self.currentCollectStr = self.strSrc[self.pos:j]
+                self.currentCollectStr = strSrc[self.pos:j]
                 # environLocal.printDebug(
                 #     ['got bidrectional rhythm mod:', repr(self.currentCollectStr)])
-                self.tokens.append(ABCBrokenRhythmMarker(self.currentCollectStr))
+                tokens.append(ABCBrokenRhythmMarker(self.currentCollectStr))
                 self.skipAhead = j - (self.pos + 1)
                 continue
 
             # get dynamics. skip over the open paren to avoid confusion.
             # NB: Nested crescendos are not an issue (not proper grammar).
             if c == '!':
-                exclaimDict = {'!crescendo(!': ABCCrescStart,
-                               '!crescendo)!': ABCParenStop,
-                               '!diminuendo(!': ABCDimStart,
-                               '!diminuendo)!': ABCParenStop,
-                               }
                 j = self.pos + 1
-                while j < self.pos + 20 and j < self.srcLen:  # a reasonable upper bound
-                    if self.strSrc[j] == '!':
-                        if self.strSrc[self.pos:j + 1] in exclaimDict:
-                            exclaimClass = exclaimDict[self.strSrc[self.pos:j + 1]]
+                while j < self.pos + 20 and j < srcLen:  # a reasonable upper bound
+                    if strSrc[j] == '!':
+                        if strSrc[self.pos:j + 1] in ABC_DYNAMICS_TOKENS:
+                            exclaimClass = ABC_DYNAMICS_TOKENS[strSrc[self.pos:j + 1]]
                             exclaimObject = exclaimClass(c)
-                            self.tokens.append(exclaimObject)
+                            tokens.append(exclaimObject)
                             self.skipAhead = j - self.pos  # not + 1
                             break
                         # NB: We're currently skipping over all other '!' expressions
@@ -2191,28 +2342,28 @@ class ABCHandler:
 
             # get slurs, ensuring that they're not confused for tuplets
             if c == '(' and cNext is not None and not cNext.isdigit():
-                self.tokens.append(ABCSlurStart(c))
+                tokens.append(ABCSlurStart(c))
                 continue
 
             # get slur/tuplet ending; treat it as a general parenthesis stop
             if c == ')':
-                self.tokens.append(ABCParenStop(c))
+                tokens.append(ABCParenStop(c))
                 continue
 
             # get ties between two notes
             if c == '-':
-                self.tokens.append(ABCTie(c))
+                tokens.append(ABCTie(c))
                 continue
 
             # get chord symbols / guitar chords; collected and joined with
             # chord or notes
             if c == '"':
                 j = self.pos + 1
-                while j < self.srcLen - 1 and self.strSrc[j] != '"':
+                while j < srcLen - 1 and strSrc[j] != '"':
                     j += 1
                 j += 1  # need character that caused break
                 # there may be more than one chord symbol: need to accumulate
-                activeChordSymbol += self.strSrc[self.pos:j]
+                activeChordSymbol += strSrc[self.pos:j]
                 # environLocal.printDebug(['got chord symbol:', repr(activeChordSymbol)])
                 self.skipAhead = j - (self.pos + 1)
                 continue
@@ -2222,24 +2373,24 @@ class ABCHandler:
                 j = self.pos + 1
 
                 # find closing chord bracket
-                while j < self.srcLen - 1 and self.strSrc[j] != ']':
+                while j < srcLen - 1 and strSrc[j] != ']':
                     j += 1
 
                 j += 1  # need character that caused break
 
                 # find outer chord length modifier
-                while j < self.srcLen and (self.strSrc[j].isdigit() or self.strSrc[j] in '/'):
+                while j < srcLen and (strSrc[j].isdigit() or strSrc[j] in '/'):
                     j += 1
 
                 # prepend chord symbol
                 if activeChordSymbol != '':
-                    self.currentCollectStr = activeChordSymbol + self.strSrc[self.pos:j]
+                    self.currentCollectStr = activeChordSymbol + strSrc[self.pos:j]
                     activeChordSymbol = ''  # reset
                 else:
-                    self.currentCollectStr = self.strSrc[self.pos:j]
+                    self.currentCollectStr = strSrc[self.pos:j]
 
                 # environLocal.printDebug(['got chord:', repr(self.currentCollectStr)])
-                self.tokens.append(ABCChord(self.currentCollectStr))
+                tokens.append(ABCChord(self.currentCollectStr))
                 self.skipAhead = j - (self.pos + 1)
                 # TODO: Chords need to be aware of accidentals too.
                 # Also what happens to prefixes and suffixes attached to chords,
@@ -2247,35 +2398,35 @@ class ABCHandler:
                 continue
 
             if c == '.':
-                self.tokens.append(ABCStaccato(c))
+                tokens.append(ABCStaccato(c))
                 continue
 
             if c == 'u':
-                self.tokens.append(ABCUpbow(c))
+                tokens.append(ABCUpbow(c))
                 continue
 
             if c == '{':
-                self.tokens.append(ABCGraceStart(c))
+                tokens.append(ABCGraceStart(c))
                 continue
 
             if c == '}':
-                self.tokens.append(ABCGraceStop(c))
+                tokens.append(ABCGraceStop(c))
                 continue
 
             if c == 'v':
-                self.tokens.append(ABCDownbow(c))
+                tokens.append(ABCDownbow(c))
                 continue
 
             if c == 'K':
-                self.tokens.append(ABCAccent(c))
+                tokens.append(ABCAccent(c))
                 continue
 
             if c == 'k':
-                self.tokens.append(ABCStraccent(c))
+                tokens.append(ABCStraccent(c))
                 continue
 
             if c == 'M':
-                self.tokens.append(ABCTenuto(c))
+                tokens.append(ABCTenuto(c))
                 continue
 
             # get the start of a note event: alpha, decoration, or accidental
@@ -2309,38 +2460,38 @@ class ABCHandler:
                     accidental = c
                 j = self.pos + 1
 
-                while j <= self.srcLen - 1:
+                while j <= srcLen - 1:
                     # if we have not found pitch alpha
                     # decorations and/or accidentals may precede note names
-                    if not foundPitchAlpha and self.strSrc[j] in accidentalsAndDecorations:
+                    if not foundPitchAlpha and strSrc[j] in accidentalsAndDecorations:
                         j += 1
-                        if self.strSrc[j] in accidentals:
-                            accidental += self.strSrc[j]
+                        if strSrc[j] in accidentals:
+                            accidental += strSrc[j]
                         continue
                     # only allow one pitch alpha to be a continue condition
-                    elif (not foundPitchAlpha and self.strSrc[j].isalpha()
+                    elif (not foundPitchAlpha and strSrc[j].isalpha()
                           # noinspection SpellCheckingInspection
-                          and self.strSrc[j] not in '~wuvhHLTSN'):
+                          and strSrc[j] not in '~wuvhHLTSN'):
                         foundPitchAlpha = True
-                        abcPitch = self.strSrc[j]
+                        abcPitch = strSrc[j]
                         j += 1
                         continue
                     # continue conditions after alpha:
                     # , register modification (, ') or number, rhythm indication
                     # number, /,
-                    elif self.strSrc[j].isdigit() or self.strSrc[j] in ',/,\'':
-                        if self.strSrc[j] in ',\'':  # Register (octave) modification
-                            abcPitch += self.strSrc[j]
+                    elif strSrc[j].isdigit() or strSrc[j] in ',/,\'':
+                        if strSrc[j] in ',\'':  # Register (octave) modification
+                            abcPitch += strSrc[j]
                         j += 1
                         continue
                     else:  # space, all else: break
                         break
                 # prepend chord symbol
                 if activeChordSymbol != '':
-                    self.currentCollectStr = activeChordSymbol + self.strSrc[self.pos:j]
+                    self.currentCollectStr = activeChordSymbol + strSrc[self.pos:j]
                     activeChordSymbol = ''  # reset
                 else:
-                    self.currentCollectStr = self.strSrc[self.pos:j]
+                    self.currentCollectStr = strSrc[self.pos:j]
                 # environLocal.printDebug(['got note event:', repr(self.currentCollectStr)])
 
                 # NOTE: skipping a number of articulations and other markers
@@ -2350,13 +2501,7 @@ class ABCHandler:
                 # v is up bow; might be: "^Segno"v which also should be dropped
                 # H is fermata
                 # . dot may be staccato, but should be attached to pitch
-                if self.currentCollectStr in ('w', 'u', 'v', 'v.', 'h', 'H', 'vk',
-                               'uk', 'U', '~',
-                               '.', '=', 'V', 'v.', 'S', 's',
-                               'i', 'I', 'ui', 'u.', 'Q', 'Hy', 'Hx',
-                               'r', 'm', 'M', 'n', 'N', 'o', 'O', 'P',
-                               'l', 'L', 'R',
-                               'y', 'T', 't', 'x', 'Z'):
+                if self.currentCollectStr in ABC_UNSUPPORTED_NOTE_COLLECTIONS:
                     pass
                 # these are bad chords, or other problematic notations like
                 # "D.C."x
@@ -2376,25 +2521,26 @@ class ABCHandler:
                     pass
                 # only let valid self.currentCollectStr strings be parsed
                 elif abcPitch:
-                    pitchClass = abcPitch[0].upper()
-                    carriedAccidental = None
-                    propagation = self._accidentalPropagation()
-                    if accidental:
-                        # Remember the active accidentals in the measure
-                        if propagation == 'octave':
-                            accidentalized[abcPitch] = accidental
-                        elif propagation == 'pitch':
-                            accidentalized[pitchClass] = accidental
-                        accidental = None
+                    # accidentals carry through the measure per octave,
+                    # per pitch class, or not at all
+                    if propagation == 'octave':
+                        accidentalKey = abcPitch
+                    elif propagation == 'pitch':
+                        accidentalKey = abcPitch[0].upper()
                     else:
-                        if propagation == 'pitch' and pitchClass in accidentalized:
-                            carriedAccidental = accidentalized[pitchClass]
-                        elif propagation == 'octave' and abcPitch in accidentalized:
-                            carriedAccidental = accidentalized[abcPitch]
+                        accidentalKey = None
+                    carriedAccidental = None
+                    if accidentalKey is not None:
+                        if accidental:
+                            # Remember the active accidentals in the measure
+                            accidentalized[accidentalKey] = accidental
+                        else:
+                            carriedAccidental = accidentalized.get(accidentalKey)
+                    accidental = None
                     abcNote = ABCNote(self.currentCollectStr, carriedAccidental=carriedAccidental)
-                    self.tokens.append(abcNote)
+                    tokens.append(abcNote)
                 else:
-                    self.tokens.append(ABCNote(self.currentCollectStr))
+                    tokens.append(ABCNote(self.currentCollectStr))
 
                 self.skipAhead = j - (self.pos + 1)
                 continue
@@ -2404,19 +2550,12 @@ class ABCHandler:
 
     def tokenProcess(self):
         '''
-        Process all token objects. First, calls preParse(), then
-        does context assignments, then calls parse().
+        Process all token objects. First, calls preParse() and
+        does context assignments, token by token, then calls parse().
         '''
         # need a key object to get altered pitches
         from music21 import key
 
-        # pre-parse : call on objects that need preliminary processing
-        # metadata, for example, is parsed
-        # lastTimeSignature = None
-        for t in self.tokens:
-            # environLocal.printDebug(['tokenProcess: calling preParse()', t.src])
-            t.preParse()
-
         # context: iterate through tokens, supplying contextual data
         # as necessary to appropriate objects
         lastDefaultQL = None
@@ -2424,42 +2563,94 @@ class ABCHandler:
         lastTimeSignatureObj = None  # an m21 object
         lastTupletToken = None  # a token obj; keeps count of usage
         lastTieToken = None
-        lastStaccToken = None
-        lastUpToken = None
-        lastDownToken = None
-        lastAccToken = None
-        lastStrAccToken = None
-        lastTenutoToken = None
+        # names of articulations waiting for the next note
+        pendingArticulations = set()
         lastGraceToken = None
         lastNoteToken = None
+        # spanners and parens are updated in place as tokens open and close them
+        activeSpanners = self.activeSpanners
+        activeParens = self.activeParens
+        # immutable snapshot of activeSpanners, shared by all notes
+        # until the active spanners change
+        spannerSnapshot = tuple(activeSpanners)
+
+        # context of tokens: the previous and next token, or None at either end
+        tokens = self.tokens
+        previousTokens = [None] + tokens[:-1]
+        nextTokens = tokens[1:] + [None]
+        for tPrev, t, tNext in zip(previousTokens, tokens, nextTokens):
+            # pre-parse : call on objects that need preliminary processing
+            # metadata, for example, is parsed.  Context below only reads
+            # pre-parsed data from the current token, so this can be done
+            # in the same pass.
+            # environLocal.printDebug(['tokenProcess: calling preParse()', t.src])
+            t.preParse()
 
-        for i in range(len(self.tokens)):
-            # get context of tokens
-            q = self._getLinearContext(self.tokens, i)
-            tPrev, t, tNext, unused_tNextNext = q
-            # tPrevNotSpace, tPrev, t, tNext, tNextNotSpace, tNextNext = q
-            # environLocal.printDebug(['tokenProcess: calling parse()', t])
+            # a single if/elif ladder, as each token is of exactly one class;
+            # the most common tokens (notes and chords, then bars) come first
 
-            if isinstance(t, ABCMetadata):
-                if t.isMeter():
+            # ABCChord inherits ABCNote, thus getting note is enough for both
+            if isinstance(t, ABCNote):
+                if lastDefaultQL is None:
+                    raise ABCHandlerException(
+                        'no active default note length provided for note processing. '
+                        + f'tPrev: {tPrev}, t: {t}, tNext: {tNext}'
+                    )
+                t.activeDefaultQuarterLength = lastDefaultQL
+                t.activeKeySignature = lastKeySignature
+                t.applicableSpanners = spannerSnapshot
+                # ends ties one note after they begin
+                if lastTieToken is not None:
+                    t.tie = 'stop'
+                    lastTieToken = None
+                if pendingArticulations:
+                    # assign a new tuple: articulations are frozen after processing
+                    t.articulations = (*t.articulations,
+                                       *(a for a in ABC_ARTICULATION_TOKENS.values()
+                                         if a in pendingArticulations))
+                    pendingArticulations.clear()
+                if lastGraceToken is not None:
+                    t.inGrace = True
+                if lastTupletToken is None:
+                    pass
+                elif lastTupletToken.noteCount == 0:
+                    lastTupletToken = None  # clear, no longer needed
+                else:
+                    lastTupletToken.noteCount -= 1  # decrement
+                    # add a reference to the note
+                    t.activeTuplet = lastTupletToken.tupletObj
+                lastNoteToken = t
+
+            elif isinstance(t, ABCBar):
+                pass  # bars need no context
+
+            # articulations are a property of the next note or chord
+            elif t.__class__ in ABC_ARTICULATION_TOKENS:
+                pendingArticulations.add(ABC_ARTICULATION_TOKENS[t.__class__])
+
+            elif isinstance(t, ABCMetadata):
+                # read the tag once, rather than calling isMeter(), isKey(), etc.
+                tag = t.tag
+                if tag == 'M':
                     lastTimeSignatureObj = t.getTimeSignatureObject()
                 # restart matching conditions; match meter twice ok
-                if t.isDefaultNoteLength() or (t.isMeter() and lastDefaultQL is None):
+                if tag == 'L' or (tag == 'M' and lastDefaultQL is None):
                     lastDefaultQL = t.getDefaultQuarterLength()
-                elif t.isKey():
+                elif tag == 'K':
                     sharpCount, mode = t.getKeySignatureParameters()
                     lastKeySignature = key.KeySignature(sharpCount)
                     if mode not in (None, ''):
                         lastKeySignature = lastKeySignature.asKey(mode)
 
-                if t.isReferenceNumber():
+                if tag == 'X':
                     # reset any spanners or parens at the end of any piece
                     # in case they aren't closed.
-                    self.activeParens = []
-                    self.activeSpanners = []
-                continue
+                    activeParens = self.activeParens = []
+                    activeSpanners = self.activeSpanners = []
+                    spannerSnapshot = ()
+
             # broken rhythms need to be applied to previous and next notes
-            if isinstance(t, ABCBrokenRhythmMarker):
+            elif isinstance(t, ABCBrokenRhythmMarker):
                 if (isinstance(tPrev, ABCNote)
                         and isinstance(tNext, ABCNote)):
                     # environLocal.printDebug(['tokenProcess: got broken rhythm marker', t.src])
@@ -2471,27 +2662,29 @@ class ABCHandler:
                          + f'({t.src}) not positioned between two notes or chords'])
 
             # need to update tuplets with currently active meter
-            if isinstance(t, ABCTuplet):
+            elif isinstance(t, ABCTuplet):
                 t.updateRatio(lastTimeSignatureObj)
                 # set number of notes that will be altered
                 # might need to do this with ql values, or look ahead to nxt
                 # token
                 t.updateNoteCount()
                 lastTupletToken = t
-                self.activeParens.append('Tuplet')
+                activeParens.append('Tuplet')
 
             # notes within slur marks need to be added to the spanner
-            if isinstance(t, ABCSlurStart):
+            elif isinstance(t, ABCSlurStart):
                 t.fillSlur()
-                self.activeSpanners.append(t.slurObj)
-                self.activeParens.append('Slur')
+                activeSpanners.append(t.slurObj)
+                spannerSnapshot = tuple(activeSpanners)
+                activeParens.append('Slur')
             elif isinstance(t, ABCParenStop):
-                if self.activeParens:
-                    p = self.activeParens.pop()
+                if activeParens:
+                    p = activeParens.pop()
                     if p in ('Slur', 'Crescendo', 'Diminuendo'):
-                        self.activeSpanners.pop()
+                        activeSpanners.pop()
+                        spannerSnapshot = tuple(activeSpanners)
 
-            if isinstance(t, ABCTie):
+            elif isinstance(t, ABCTie):
                 # tPrev is usually an ABCNote but may be a GraceStop.
                 if lastNoteToken and lastNoteToken.tie == 'stop':
                     lastNoteToken.tie = 'continue'
@@ -2499,88 +2692,30 @@ class ABCHandler:
                     lastNoteToken.tie = 'start'
                 lastTieToken = t
 
-            if isinstance(t, ABCStaccato):
-                lastStaccToken = t
-
-            if isinstance(t, ABCUpbow):
-                lastUpToken = t
-
-            if isinstance(t, ABCDownbow):
-                lastDownToken = t
-
-            if isinstance(t, ABCAccent):
-                lastAccToken = t
-
-            if isinstance(t, ABCStraccent):
-                lastStrAccToken = t
-
-            if isinstance(t, ABCTenuto):
-                lastTenutoToken = t
-
-            if isinstance(t, ABCCrescStart):
+            elif isinstance(t, ABCCrescStart):
                 t.fillCresc()
-                self.activeSpanners.append(t.crescObj)
-                self.activeParens.append('Crescendo')
+                activeSpanners.append(t.crescObj)
+                spannerSnapshot = tuple(activeSpanners)
+                activeParens.append('Crescendo')
 
-            if isinstance(t, ABCDimStart):
+            elif isinstance(t, ABCDimStart):
                 t.fillDim()
-                self.activeSpanners.append(t.dimObj)
-                self.activeParens.append('Diminuendo')
+                activeSpanners.append(t.dimObj)
+                spannerSnapshot = tuple(activeSpanners)
+                activeParens.append('Diminuendo')
 
-            if isinstance(t, ABCGraceStart):
+            elif isinstance(t, ABCGraceStart):
                 lastGraceToken = t
 
-            if isinstance(t, ABCGraceStop):
+            elif isinstance(t, ABCGraceStop):
                 lastGraceToken = None
 
-            # ABCChord inherits ABCNote, thus getting note is enough for both
-            if isinstance(t, (ABCNote, ABCChord)):
-                if lastDefaultQL is None:
-                    raise ABCHandlerException(
-                        'no active default note length provided for note processing. '
-                        + f'tPrev: {tPrev}, t: {t}, tNext: {tNext}'
-                    )
-                t.activeDefaultQuarterLength = lastDefaultQL
-                t.activeKeySignature = lastKeySignature
-                t.applicableSpanners = self.activeSpanners[:]  # fast copy of a list
-                # ends ties one note after they begin
-                if lastTieToken is not None:
-                    t.tie = 'stop'
-                    lastTieToken = None
-                if lastStaccToken is not None:
-                    t.articulations.append('staccato')
-                    lastStaccToken = None
-                if lastUpToken is not None:
-                    t.articulations.append('upbow')
-                    lastUpToken = None
-                if lastDownToken is not None:
-                    t.articulations.append('downbow')
-                    lastDownToken = None
-                if lastAccToken is not None:
-                    t.articulations.append('accent')
-                    lastAccToken = None
-                if lastStrAccToken is not None:
-                    t.articulations.append('strongaccent')
-                    lastStrAccToken = None
-                if lastTenutoToken is not None:
-                    t.articulations.append('tenuto')
-                    lastTenutoToken = None
-                if lastGraceToken is not None:
-                    t.inGrace = True
-                if lastTupletToken is None:
-                    pass
-                elif lastTupletToken.noteCount == 0:
-                    lastTupletToken = None  # clear, no longer needed
-                else:
-                    lastTupletToken.noteCount -= 1  # decrement
-                    # add a reference to the note
-                    t.activeTuplet = lastTupletToken.tupletObj
-                lastNoteToken = t
-
         # parse : call methods to set attributes and parse abc string
         for t in self.tokens:
             # environLocal.printDebug(['tokenProcess: calling parse()', t])
             t.parse()
+            if isinstance(t, ABCNote):
+                t.freeze()
 
     def process(self, strSrc: str) -> None:
         self.tokens = []
@@ -2747,7 +2882,7 @@ class ABCHandler:
             ahDict[None] = ABCHandler()
 
         for thisABCHandler in ahDict.values():
-            thisABCHandler.tokens = prependToAllList[:] + thisABCHandler.tokens
+            thisABCHandler.tokens = prependToAllList + thisABCHandler.tokens
 
         return ahDict
 
@@ -2794,18 +2929,11 @@ class ABCHandler:
         '''
         if not self.tokens:
             raise ABCHandlerException('must process tokens before calling split')
-        count = 0
-        for i in range(len(self.tokens)):
-            t = self.tokens[i]
-            if isinstance(t, ABCBar):
-                # must define at least 2 regular barlines
-                # this leave out cases where only double bars are given
-                if t.isRegular():
-                    count += 1
-                    # forcing the inclusion of two measures to count
-                    if count >= 2:
-                        return True
-        return False
+        # must define at least 2 regular barlines
+        # this leave out cases where only double bars are given
+        regularBars = (t for t in self.tokens if isinstance(t, ABCBar) and t.isRegular())
+        # forcing the inclusion of two measures to count; stop after the second
+        return len(list(itertools.islice(regularBars, 2))) == 2
 
     def splitByVoice(self) -> List['ABCHandler']:
         # noinspection PyShadowingNames
@@ -2856,17 +2984,11 @@ class ABCHandler:
         if not self.tokens:
             raise ABCHandlerException('must process tokens before calling split')
 
-        voiceCount = 0
-        pos = []
-        for i in range(len(self.tokens)):
-            t = self.tokens[i]
-            if isinstance(t, ABCMetadata):
-                if t.isVoice():
-                    # if first char is a number
-                    # can be V:3 name="Bass" snm="b" clef=bass
-                    if t.data[0].isdigit():
-                        pos.append(i)  # store position
-                        voiceCount += 1
+        # store positions of voice fields whose first char is a number
+        # can be V:3 name="Bass" snm="b" clef=bass
+        pos = [i for i, t in enumerate(self.tokens)
+               if isinstance(t, ABCMetadata) and t.tag == 'V' and t.data[0].isdigit()]
+        voiceCount = len(pos)
 
         abcHandlers = []
         # no voices, or definition of one voice, or use of V: field for
@@ -2877,18 +2999,10 @@ class ABCHandler:
             abcHandlers.append(ah)
         # two or more voices
         else:
-            # collect start and end pairs of split
-            pairs = []
-            pairs.append([0, pos[0]])
-            i = pos[0]
-            for x in range(1, len(pos)):
-                j = pos[x]
-                pairs.append([i, j])
-                i = j
-            # add last
-            pairs.append([i, len(self)])
-
-            for x, y in pairs:
+            # split at each voice: common metadata, then each voice up
+            # to the start of the next, and the last voice up to the end
+            boundaries = [0] + pos + [len(self)]
+            for x, y in zip(boundaries, boundaries[1:]):
                 ah = self.__class__()
                 ah.tokens = self.tokens[x:y]
                 abcHandlers.append(ah)
@@ -2965,13 +3079,15 @@ class ABCHandler:
             raise ABCHandlerException('must process tokens before calling split')
 
         abcBarHandlers = []
+        tokens = self.tokens
+        numTokens = len(tokens)
         barIndices = self.tokensToBarIndices()
 
         # barCount = 0  # not used
         # noteCount = 0  # not used
 
         # environLocal.printDebug(['splitByMeasure(); raw bar positions', barIndices])
-        measureIndices = self._buildMeasureBoundaryIndices(barIndices, len(self) - 1)
+        measureIndices = self._buildMeasureBoundaryIndices(barIndices, numTokens - 1)
         # for x, y in pairs:
         #     environLocal.printDebug(['boundary indices:', x, y])
         #     environLocal.printDebug(['    values at x, y', self.tokens[x], self.tokens[y]])
@@ -2985,8 +3101,9 @@ class ABCHandler:
             yClip = y
 
             # check if first is a bar; if so, assign and remove
-            if isinstance(self.tokens[x], ABCBar):
-                lbCandidate = self.tokens[x]
+            xToken = tokens[x]
+            if isinstance(xToken, ABCBar):
+                lbCandidate = xToken
                 # if we get an end repeat, probably already assigned this
                 # in the last measure, so skip
                 # environLocal.printDebug(['reading pairs, got token:', lbCandidate,
@@ -3006,7 +3123,7 @@ class ABCHandler:
 
             # if x boundary is metadata, do not include it (as it is likely in the previous
             # measure) unless it is at the beginning.
-            elif x != 0 and isinstance(self.tokens[x], ABCMetadata):
+            elif x != 0 and isinstance(xToken, ABCMetadata):
                 xClip = x + 1
             else:
                 # if we find a note in the x-clip position, it is likely a pickup the
@@ -3014,36 +3131,37 @@ class ABCHandler:
                 # should be part of this branch
                 pass
 
-            if y >= len(self):
-                yTestIndex = len(self)
+            if y >= numTokens:
+                yTestIndex = numTokens
             else:
                 yTestIndex = y
 
-            if isinstance(self.tokens[yTestIndex], ABCBar):
-                rbCandidate = self.tokens[yTestIndex]
+            yToken = tokens[yTestIndex]
+            if isinstance(yToken, ABCBar):
+                rbCandidate = yToken
                 # if a start repeat, save it to be placed as a left barline
                 if not (rbCandidate.barType == 'repeat'
                         and rbCandidate.repeatForm == 'start'):
                     # environLocal.printDebug(['splitByMeasure(); assigning right bar token',
                     #                             lbCandidate])
-                    ah.rightBarToken = self.tokens[yTestIndex]
+                    ah.rightBarToken = rbCandidate
                 # always trim if we have a bar
                 # ah.tokens = ah.tokens[:-1]  # remove last
                 yClip = y - 1
             # if y boundary is metadata, include it
-            elif isinstance(self.tokens[yTestIndex], ABCMetadata):
+            elif isinstance(yToken, ABCMetadata):
                 pass  # no change
             # if y position is a note/chord, and this is the last index,
-            # must included it
-            elif not (isinstance(self.tokens[yTestIndex], (ABCNote, ABCChord))
-                      and yTestIndex == len(self.tokens) - 1):
+            # must included it (ABCChord inherits ABCNote)
+            elif not (isinstance(yToken, ABCNote)
+                      and yTestIndex == numTokens - 1):
                 # if we find a note in the yClip position, it is likely
                 # a pickup, the first note after metadata. we do not include this
                 yClip = yTestIndex - 1
 
             # environLocal.printDebug(['clip boundaries: x,y', xClip, yClip])
             # boundaries are inclusive; need to add one here
-            ah.tokens = self.tokens[xClip:yClip + 1]
+            ah.tokens = tokens[xClip:yClip + 1]
             # after bar assign, if no bars known, reject
             if not ah:
                 continue
@@ -3063,13 +3181,9 @@ class ABCHandler:
         bar lines or the last piece of metadata before a note or chord.
         '''
         barIndices = []
-        tNext = None
-        for i, t in enumerate(self.tokens):
-            try:
-                tNext = self.tokens[i + 1]
-            except IndexError:
-                tNext = None
-
+        tokens = self.tokens
+        lastIndex = len(tokens) - 1
+        for i, t in enumerate(tokens):
             # either we get a bar, or we just complete metadata and we
             # encounter a note (a pickup)
             if isinstance(t, ABCBar):  # or (barCount == 0 and noteCount > 0):
@@ -3077,10 +3191,10 @@ class ABCHandler:
                 barIndices.append(i)  # store position
                 # barCount += 1  # not used
             # case of end of metadata and start of notes in a pickup
-            # tag the last metadata as the end
+            # tag the last metadata as the end; ABCChord inherits ABCNote
             elif (isinstance(t, ABCMetadata)
-                  and tNext is not None
-                  and isinstance(tNext, (ABCNote, ABCChord))):
+                  and i < lastIndex
+                  and isinstance(tokens[i + 1], ABCNote)):
                 barIndices.append(i)  # store position
 
         return barIndices
@@ -3105,15 +3219,8 @@ class ABCHandler:
         '''
         if not self.tokens:
             raise ABCHandlerException('must process tokens before calling')
-        count = 0
-        for t in self.tokens:
-            if isinstance(t, (ABCNote, ABCChord)):
-                count += 1
-        # environLocal.printDebug(['hasNotes', count])
-        if count > 0:
-            return True
-        else:
-            return False
+        # ABCChord inherits ABCNote; stop at the first one found
+        return any(isinstance(t, ABCNote) for t in self.tokens)
 
     def getTitle(self) -> Optional[str]:
         '''
@@ -3138,6 +3245,8 @@ class ABCHandlerBar(ABCHandler):
     # divide elements of a character stream into objects and handle
     # store in a list, and pass global information to components
 
+    __slots__ = ('leftBarToken', 'rightBarToken')
+
     def __init__(self):
         # tokens are ABC objects in a linear stream
         super().__init__()
@@ -3145,31 +3254,40 @@ class ABCHandlerBar(ABCHandler):
         self.leftBarToken = None
         self.rightBarToken = None
 
+    @staticmethod
+    def _mergeBarTokens(bOld, bNew):
+        '''
+        Return the bar token to keep when a handler with bar token bOld
+        is added to a handler with bar token bNew; either may be None.
+
+        >>> barA = abcFormat.ABCBar('|')
+        >>> barB = abcFormat.ABCBar(':|')
+        >>> abcFormat.ABCHandlerBar._mergeBarTokens(None, None) is None
+        True
+        >>> abcFormat.ABCHandlerBar._mergeBarTokens(barA, None) is barA
+        True
+        >>> abcFormat.ABCHandlerBar._mergeBarTokens(None, barB) is barB
+        True
+        >>> abcFormat.ABCHandlerBar._mergeBarTokens(barA, barB) is barB
+        True
+        '''
+        if bNew is None:
+            return bOld  # get old, or nothing to do if both are None
+        if bOld is not None and bOld.src != bNew.src:
+            # might resolve this by ignoring standard bars and favoring
+            # repeats or styled bars
+            environLocal.printDebug(['cannot handle two non-None bars yet: got bNew, bOld',
+                                     bNew, bOld])
+            # raise ABCHandlerException('cannot handle two non-None bars yet')
+        # get new; if both are the same, assign one
+        return bNew
+
     def __add__(self, other):
         ah = self.__class__()  # will get the same class type
         ah.tokens = self.tokens + other.tokens
         # get defined tokens
-        for barAttr in ('leftBarToken', 'rightBarToken'):
-            bOld = getattr(self, barAttr)
-            bNew = getattr(other, barAttr)
-            if bNew is None and bOld is None:
-                pass  # nothing to do
-            elif bNew is not None and bOld is None:  # get new
-                setattr(ah, barAttr, bNew)
-            elif bNew is None and bOld is not None:  # get old
-                setattr(ah, barAttr, bOld)
-            else:
-                # if both ar the same, assign one
-                if bOld.src == bNew.src:
-                    setattr(ah, barAttr, bNew)
-                else:
-                    # might resolve this by ignoring standard bars and favoring
-                    # repeats or styled bars
-                    environLocal.printDebug(['cannot handle two non-None bars yet: got bNew, bOld',
-                                             bNew, bOld])
-                    # raise ABCHandlerException('cannot handle two non-None bars yet')
-                    setattr(ah, barAttr, bNew)
-
+        ah.leftBarToken = self._mergeBarTokens(self.leftBarToken, other.leftBarToken)
+        ah.rightBarToken = self._mergeBarTokens(self.rightBarToken, other.rightBarToken)
         return ah
 
 
@@ -3181,21 +3299,22 @@ def mergeLeadingMetaData(barHandlers: List[ABCHandlerBar]) -> List[ABCHandlerBar
 
     This consolidates all metadata in bar-like entities.
     '''
-    mCount = 0
-    metadataPos = []  # store indices of handlers that are all metadata
-    for i in range(len(barHandlers)):
-        if barHandlers[i].hasNotes():
-            mCount += 1
-        else:
-            metadataPos.append(i)
+    # store indices of handlers that are all metadata; a set, as it is
+    # tested once per handler below
+    metadataPos = {i for i, h in enumerate(barHandlers) if not h.hasNotes()}
+    mCount = len(barHandlers) - len(metadataPos)
     # environLocal.printDebug(['mergeLeadingMetaData()',
     #                        'metadataPosList', metadataPos, 'mCount', mCount])
     # merge meta data into bars for processing
     mergedHandlers = []
     if mCount <= 1:  # if only one true measure, do not create measures
+        # concatenate all, extending one token list in place rather than
+        # building a new handler for each addition
         ahb = ABCHandlerBar()
         for h in barHandlers:
-            ahb += h  # concatenate all
+            ahb.tokens.extend(h.tokens)
+            ahb.leftBarToken = ahb._mergeBarTokens(ahb.leftBarToken, h.leftBarToken)
+            ahb.rightBarToken = ahb._mergeBarTokens(ahb.rightBarToken, h.rightBarToken)
         mergedHandlers.append(ahb)
     else:
         # when we have metadata, we need to pass its tokens with those
@@ -3298,40 +3417,36 @@ class ABCFile(prebase.ProtoM21Object):
             reference number in source file: 99
 
 
+        Reference numbers may be zero-padded in the file:
+
+        >>> print(abcFormat.ABCFile.extractReferenceNumber('X:0490\\nHello\\nX:491\\n', 490))
+        X:0490
+        Hello
+
         If the same number is defined twice in one file (should not be) only
         the first data is returned.
 
+        >>> print(abcFormat.ABCFile.extractReferenceNumber('X:1\\nA\\nX:1\\nB\\nX:2\\nC\\n', 1))
+        X:1
+        A
+
         Changed in v6.2: now a static method.
         '''
-        collect = []
-        gather = False
-        for line in strSrc.split('\n'):
-            # must be a single line definition
-            # rstrip because of '\r\n' carriage returns
-            if line.strip().startswith('X:') and line.replace(' ', '').rstrip() == f'X:{number}':
-                gather = True
-            elif line.strip().startswith('X:') and not gather:
-                # some numbers are like X:0490 but we may request them as 490...
-                try:
-                    forcedNum = int(line.replace(' ', '').rstrip().replace('X:', ''))
-                    if forcedNum == int(number):
-                        gather = True
-                except TypeError:
-                    pass
-            # if already gathering and find another ref number definition
-            # stop gathering
-            elif gather and line.strip().startswith('X:'):
-                break
-
-            if gather:
-                collect.append(line)
-
-        if not collect:
+        # some numbers are like X:0490 but we may request them as 490...
+        number = int(number)
+        start = None
+        # find all reference number definitions; each must be a single line
+        for m in reReferenceNumber.finditer(strSrc):
+            if start is not None:
+                # found the next ref number definition; stop before its line break
+                return strSrc[start:m.start() - 1]
+            if m.group(1) is not None and int(m.group(1)) == number:
+                start = m.start()
+
+        if start is None:
             raise ABCFileException(
                 f'cannot find requested reference number in source file: {number}')
-
-        referenceNumbers = '\n'.join(collect)
-        return referenceNumbers
+        return strSrc[start:]
 
     def readstr(self, strSrc: str, number: Optional[int] = None) -> ABCHandler:
         '''
@@ -3446,6 +3561,20 @@ class Test(unittest.TestCase):
             handler.tokenize(tf)
             handler.tokenProcess()
 
+    def testTokenProcessTwice(self):
+        handler = ABCHandler()
+        handler.tokenize('L:1/8\nK:C\n.c(de) uf|\n')
+        handler.tokenProcess()
+        notes = [t for t in handler.tokens if isinstance(t, ABCNote)]
+        self.assertEqual(notes[0].articulations, ('staccato',))
+        self.assertEqual(notes[3].articulations, ('upbow',))
+
+        # processing frozen notes again must not fail
+        handler.tokenProcess()
+        self.assertIn('staccato', notes[0].articulations)
+        self.assertIn('upbow', notes[3].articulations)
+        self.assertEqual(notes[1].articulations, ())
+
     def testNoteParse(self):
         from music21 import key
 
@@ -3466,6 +3595,32 @@ class Test(unittest.TestCase):
         self.assertEqual(an.getPitchName('B'), ('B4', None))
         self.assertEqual(an.getPitchName('_B'), ('B-4', True))
 
+    def testChordParse(self):
+        from music21 import key
+
+        # a repeated chord is parsed into new notes each time
+        chords = []
+        for unused in range(2):
+            ac = ABCChord('[c^eg]2')
+            ac.activeDefaultQuarterLength = 0.5
+            ac.activeKeySignature = key.KeySignature(0)
+            ac.parse()
+            chords.append(ac)
+        first = chords[0]
+        second = chords[1]
+        self.assertEqual([t.pitchName for t in first.subTokens], ['C5', 'E#5', 'G5'])
+        self.assertEqual([t.pitchName for t in second.subTokens], ['C5', 'E#5', 'G5'])
+        self.assertEqual(first.quarterLength, 1.0)
+        for t1, t2 in zip(first.subTokens, second.subTokens):
+            self.assertIsNot(t1, t2)
+
+        # a nested bracket is not a note; parsing it fails every time
+        for src in ('[[ceg]e]2', '[c[eg]2'):
+            for unused in range(2):
+                ac = ABCChord(src)
+                ac.activeDefaultQuarterLength = 0.5
+                self.assertRaises(ValueError, ac.parse)
+
     def testSplitByMeasure(self):
 
         from music21.abcFormat import testFiles
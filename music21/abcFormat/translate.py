@@ -22,7 +22,6 @@ module's :func:`~music21.converter.parse` function.
 
 import copy
 import unittest
-import re
 
 from music21 import clef
 from music21 import common
@@ -232,24 +231,35 @@ def parseTokens(mh, dst, p, useMeasures):
     # in case need to transpose due to clef indication
     from music21 import abcFormat
 
+    # bind token classes and the append method once, rather than per token
+    ABCMetadata = abcFormat.ABCMetadata
+    ABCNote = abcFormat.ABCNote
+    ABCChord = abcFormat.ABCChord
+    ABCSlurStart = abcFormat.ABCSlurStart
+    ABCCrescStart = abcFormat.ABCCrescStart
+    ABCDimStart = abcFormat.ABCDimStart
+    dstAppend = dst.coreAppend
+
     postTransposition = 0
     clefSet = False
     for t in mh.tokens:
-        if isinstance(t, abcFormat.ABCMetadata):
-            if t.isMeter():
+        if isinstance(t, ABCMetadata):
+            # read the tag once, rather than calling isMeter(), isKey(), etc.
+            tag = t.tag
+            if tag == 'M':
                 ts = t.getTimeSignatureObject()
                 if ts is not None:  # can be None
                     # should append at the right position
                     if useMeasures:  # assume at start of measures
                         dst.timeSignature = ts
                     else:
-                        dst.coreAppend(ts)
-            elif t.isKey():
+                        dstAppend(ts)
+            elif tag == 'K':
                 ks = t.getKeySignatureObject()
                 if useMeasures:  # assume at start of measures
                     dst.keySignature = ks
                 else:
-                    dst.coreAppend(ks)
+                    dstAppend(ks)
                 # check for clef information sometimes stored in key
                 clefObj, transposition = t.getClefObject()
                 if clefObj is not None:
@@ -259,31 +269,31 @@ def parseTokens(mh, dst, p, useMeasures):
                     if useMeasures:  # assume at start of measures
                         dst.clef = clefObj
                     else:
-                        dst.coreAppend(clefObj)
+                        dstAppend(clefObj)
                     postTransposition = transposition
-            elif t.isTempo():
+            elif tag == 'Q':
                 mmObj = t.getMetronomeMarkObject()
-                dst.coreAppend(mmObj)
+                dstAppend(mmObj)
 
-        elif isinstance(t, abcFormat.ABCNote):
+        elif isinstance(t, ABCNote):
             # add the attached chord symbol
             if t.chordSymbols:
                 cs_name = t.chordSymbols[0]
-                cs_name = re.sub('["]', '', cs_name).lstrip().rstrip()
-                cs_name = re.sub('[()]', '', cs_name)
+                cs_name = cs_name.replace('"', '').strip()
+                cs_name = cs_name.replace('(', '').replace(')', '')
                 cs_name = common.cleanedFlatNotation(cs_name)
                 try:
                     if cs_name in ('NC', 'N.C.', 'No Chord', 'None'):
                         cs = harmony.NoChord(cs_name)
                     else:
                         cs = harmony.ChordSymbol(cs_name)
-                    dst.coreAppend(cs, setActiveSite=False)
+                    dstAppend(cs, setActiveSite=False)
                     dst.coreElementsChanged()
                 except ValueError:
                     pass  # Exclude malformed chord
 
             # as ABCChord is subclass of ABCNote, handle first
-            if isinstance(t, abcFormat.ABCChord):
+            if isinstance(t, ABCChord):
                 # Skip an empty chord
                 if not t.subTokens:
                     continue
@@ -293,7 +303,7 @@ def parseTokens(mh, dst, p, useMeasures):
                 accStatusList = []  # accidental display status list
                 for tSub in t.subTokens:
                     # notes are contained as subTokens are already parsed
-                    if isinstance(tSub, abcFormat.ABCNote):
+                    if isinstance(tSub, ABCNote):
                         pitchNameList.append(tSub.pitchName)
                         accStatusList.append(tSub.accidentalDisplayStatus)
                 c = chord.Chord(pitchNameList)
@@ -308,7 +318,7 @@ def parseTokens(mh, dst, p, useMeasures):
                     if c.pitches[pIndex].accidental is None:
                         continue
                     c.pitches[pIndex].accidental.displayStatus = accStatusList[pIndex]
-                dst.coreAppend(c)
+                dstAppend(c)
 
                 # ql += t.quarterLength
             else:
@@ -343,21 +353,20 @@ def parseTokens(mh, dst, p, useMeasures):
                     n = n.getGrace()
 
                 n.articulations = []
-                while any(t.articulations):
-                    tokenArticulationStr = t.articulations.pop()
+                for tokenArticulationStr in reversed(t.articulations):
                     if tokenArticulationStr not in _abcArticulationsToM21:
                         continue
                     m21ArticulationClass = _abcArticulationsToM21[tokenArticulationStr]
                     m21ArticulationObj = m21ArticulationClass()
                     n.articulations.append(m21ArticulationObj)
 
-                dst.coreAppend(n, setActiveSite=False)
+                dstAppend(n, setActiveSite=False)
 
-        elif isinstance(t, abcFormat.ABCSlurStart):
+        elif isinstance(t, ABCSlurStart):
             p.coreAppend(t.slurObj)
-        elif isinstance(t, abcFormat.ABCCrescStart):
+        elif isinstance(t, ABCCrescStart):
             p.coreAppend(t.crescObj)
-        elif isinstance(t, abcFormat.ABCDimStart):
+        elif isinstance(t, ABCDimStart):
             p.coreAppend(t.dimObj)
     dst.coreElementsChanged()
     return postTransposition, clefSet
@@ -390,7 +399,8 @@ def abcToStreamScore(abcHandler, inputM21=None):
     titleCount = 0
     for t in abcHandler.tokens:
         if isinstance(t, abcFormat.ABCMetadata):
-            if t.isTitle():
+            tag = t.tag
+            if tag == 'T':
                 if titleCount == 0:  # first
                     md.title = t.data
                     # environLocal.printDebug(['got metadata title', md.title])
@@ -400,14 +410,14 @@ def abcToStreamScore(abcHandler, inputM21=None):
                     md.alternativeTitle = t.data
                     # environLocal.printDebug(['got alternative title', md.alternativeTitle])
                     titleCount += 1
-            elif t.isComposer():
+            elif tag == 'C':
                 md.composer = t.data
 
-            elif t.isOrigin():
+            elif tag == 'O':
                 md.localeOfComposition = t.data
                 # environLocal.printDebug(['got local of composition', md.localOfComposition])
 
-            elif t.isReferenceNumber():
+            elif tag == 'X':
                 md.number = int(t.data)  # convert to int?
                 # environLocal.printDebug(['got work number', md.number])
 